@@ -1,21 +1,81 @@
-import datetime
+import errno
+import gzip
+import hashlib
+import ipaddress
+import logging
+import selectors
 import socket
+import sys
+import threading
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import os
 import psutil
 import requests
-from flask import Flask, render_template_string, request, redirect, url_for
+from flask import Flask, Response, jsonify, request, redirect, url_for
+from flask_caching import Cache
 import subprocess
 import argparse  # used to parse command line options like --port or --production
 from waitress import serve  # production-ready WSGI server
 
 app = Flask(__name__)
+logger = logging.getLogger(__name__)
+# Process-local cache used to share the rendered index page between requests
+# that arrive within a couple of seconds of each other.
+cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+INDEX_CACHE_TIMEOUT = 2
+
+# Page size used to convert /proc/<pid>/statm page counts into bytes.
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
 
 # Base URL used to generate external service links. The port number for each
 # service will be appended to this address when building the table.
 EXTERNAL_IP = "http://193.237.136.211"
 
+# The public IP rarely changes, so cache it rather than querying an external
+# service on every page load. The lock stops concurrent Waitress workers from
+# all fetching it at once when the cache expires. Failed lookups are only
+# cached briefly so a network blip doesn't disable forwarding checks for long.
+# An expiry of None means the cache has never been populated.
+_PUBLIC_IP_TTL = 3600
+_PUBLIC_IP_RETRY = 30
+_public_ip_cache: Dict = {"ip": "", "expires": None}
+_public_ip_lock = threading.Lock()
+
+# Per-service details that are expensive to work out (friendly name and the
+# forwarding probe) are cached by (pid, port) for a short time. Entries are
+# only reused while the process keeps the same create time, so a recycled PID
+# is never mistaken for the old process.
+_SVC_CACHE_TTL = 30
+_svc_cache: Dict[Tuple[int, int], Tuple[float, Dict]] = {}
+
+# Process objects are kept between requests so cpu_percent() can be called
+# without blocking: psutil measures CPU usage since the previous call on the
+# same object. A newly seen process reports 0.0 until the next refresh.
+_proc_cache: Dict[int, psutil.Process] = {}
+
+# Service details are collected by a background thread and served to requests
+# from this snapshot. Regular collection also keeps cpu_percent() meaningful,
+# since each value covers the time since the previous collection.
+_SNAPSHOT_INTERVAL = 2
+_snapshot: Dict = {"services": None}
+_snapshot_lock = threading.Lock()
+
+# PIDs that were just stopped or restarted, mapped to a monotonic deadline.
+# They are hidden from published snapshots until they stop listening, so a
+# collection that started before the stop (or a process still shutting down
+# after SIGTERM) can't bring the row back. The deadline stops a process that
+# ignores SIGTERM from staying hidden for good. Guarded by _snapshot_lock.
+_FORGET_TIMEOUT = 10
+_forgotten_pids: Dict[int, float] = {}
+
+# Listening sockets are cached briefly so rapid refreshes don't rescan every
+# socket on the system. A timestamp of None means the cache has never been
+# populated.
+_LISTENERS_TTL = 5
+_listeners_cache: Dict = {"conns": [], "ts": None}
+_listeners_lock = threading.Lock()
+
 # HTML template used to display the service table. Jinja2 syntax is used to
 # substitute values. Each service row includes a link to the running service.
 HTML_TEMPLATE = """
@@ -51,10 +111,10 @@ HTML_TEMPLATE = """
             <td>{{ svc.port }}</td>
             <td>{{ svc.protocol }}</td>
             <td>{{ svc.uptime }}</td>
-            <td>{{ '{:.1f}'.format(svc.cpu) }}</td>
-            <td>{{ '{:.1f}'.format(svc.mem) }}</td>
-            <td>{{ 'Yes' if svc.forwarded else 'No' }}</td>
-            <td><a href="{{ external_ip }}:{{ svc.port }}" target="_blank">External</a></td>
+            <td>{{ svc.cpu_str }}</td>
+            <td>{{ svc.mem_str }}</td>
+            <td>{{ svc.forwarded_str }}</td>
+            <td><a href="{{ svc.external_url }}" target="_blank">External</a></td>
             <td>
                 <form method="post" action="/stop/{{ svc.pid }}">
                     <button type="submit">Stop</button>
@@ -81,29 +141,190 @@ HTML_TEMPLATE = """
 </html>
 """
 
+# Compile the template once at import time rather than on every request.
+# Flask's Jinja environment autoescapes templates loaded from strings.
+_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
 
 def format_uptime(seconds: float) -> str:
-    """Convert seconds into a human readable H:M:S string."""
-    return str(datetime.timedelta(seconds=int(seconds)))
+    """Convert seconds into a human readable H:M:S string.
 
+    The output matches ``str(datetime.timedelta(seconds=int(seconds)))`` but
+    avoids creating a timedelta for every service on every refresh.
+    """
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    text = f"{hours}:{minutes:02d}:{secs:02d}"
+    if days:
+        text = f"{days} day{'s' if days != 1 else ''}, {text}"
+    return text
 
-def check_port_forwarding(public_ip: str, port: int, timeout: float = 1.0) -> bool:
-    """Attempt to connect to the given public IP and port to test forwarding."""
+
+# Error codes a non-blocking connect returns while the connection is still
+# being established. Windows reports WSAEWOULDBLOCK rather than EINPROGRESS.
+_CONNECT_IN_PROGRESS = (
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK),
+)
+
+
+def check_ports_forwarding(
+    public_ip: str, ports: List[int], timeout: float = 0.25
+) -> Dict[int, bool]:
+    """Test forwarding for several ports on the public IP at once.
+
+    Non-blocking connects are started for every port and then waited on
+    together, so the whole batch takes at most ``timeout`` seconds.
+    """
+    results = dict.fromkeys(ports, False)
+    family = socket.AF_INET6 if ":" in public_ip else socket.AF_INET
+    selector = selectors.DefaultSelector()
     try:
-        with socket.create_connection((public_ip, port), timeout=timeout):
-            return True
-    except Exception:
-        return False
+        for port in ports:
+            try:
+                sock = socket.socket(family, socket.SOCK_STREAM)
+            except OSError:
+                continue
+            try:
+                sock.setblocking(False)
+                err = sock.connect_ex((public_ip, port))
+                if err in _CONNECT_IN_PROGRESS:
+                    selector.register(sock, selectors.EVENT_WRITE, port)
+                    continue
+                results[port] = err == 0
+            except OSError:
+                # A bad address for one port shouldn't abort the batch.
+                pass
+            sock.close()
+
+        deadline = time.monotonic() + timeout
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in selector.select(remaining):
+                # A socket becomes writable once the connect has finished;
+                # SO_ERROR tells us whether it succeeded.
+                sock = key.fileobj
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                results[key.data] = err == 0
+                selector.unregister(sock)
+                sock.close()
+    except OSError:
+        # Ports whose connect hasn't completed are reported as not forwarded.
+        pass
+    finally:
+        # Close any sockets that were still connecting when time ran out.
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
+    return results
+
+
+def check_port_forwarding(public_ip: str, port: int, timeout: float = 0.25) -> bool:
+    """Attempt to connect to the given public IP and port to test forwarding."""
+    return check_ports_forwarding(public_ip, [port], timeout)[port]
 
 
 def get_public_ip() -> str:
-    """Get the device's public IP using an external service."""
+    """Get the device's public IP using an external service.
+
+    The result is cached for ``_PUBLIC_IP_TTL`` seconds, or for
+    ``_PUBLIC_IP_RETRY`` seconds if the lookup failed.
+    """
+    with _public_ip_lock:
+        expires = _public_ip_cache["expires"]
+        if expires is not None and time.monotonic() < expires:
+            return _public_ip_cache["ip"]
+        try:
+            response = requests.get("https://api.ipify.org", timeout=2)
+            response.raise_for_status()
+            ip = response.text.strip()
+        except Exception:
+            ip = ""
+        ttl = _PUBLIC_IP_TTL if ip else _PUBLIC_IP_RETRY
+        _public_ip_cache["ip"] = ip
+        _public_ip_cache["expires"] = time.monotonic() + ttl
+        return ip
+
+
+def _read_proc_comm(pid: int) -> str:
+    """Read a process name straight from /proc on Linux."""
+    with open(f"/proc/{pid}/comm", "rb") as f:
+        return f.read().strip().decode(errors="surrogateescape")
+
+
+def _read_proc_cmdline(pid: int) -> List[str]:
+    """Read a process command line straight from /proc on Linux.
+
+    Like psutil, this handles processes that rewrite their command line as a
+    single space separated string (e.g. with setproctitle).
+    """
+    with open(f"/proc/{pid}/cmdline", "rb") as f:
+        data = f.read()
+    if not data:
+        return []
+    sep = b"\x00" if data.endswith(b"\x00") else b" "
+    if data.endswith(sep):
+        data = data[:-1]
+    args = data.split(sep)
+    if sep == b"\x00" and len(args) == 1 and b" " in data:
+        args = data.split(b" ")
+    return [arg.decode(errors="surrogateescape") for arg in args]
+
+
+def _read_proc_rss(pid: int) -> int:
+    """Read a process's resident set size in bytes from /proc on Linux."""
+    with open(f"/proc/{pid}/statm") as f:
+        # The second field is the number of resident pages.
+        return int(f.read().split()[1]) * _PAGE_SIZE
+
+
+def _get_rss_mb(proc: psutil.Process) -> float:
+    """Return the resident memory of a process in MB.
+
+    On Linux this reads /proc/<pid>/statm directly instead of building the
+    full memory_info() tuple. psutil is used elsewhere or on failure.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            rss = _read_proc_rss(proc.pid)
+        except (OSError, ValueError, IndexError):
+            pass
+        else:
+            return rss / (1024 * 1024)
+    return proc.memory_info().rss / (1024 * 1024)
+
+
+def _get_name_and_cmdline(proc: psutil.Process) -> Tuple[str, List[str]]:
+    """Return the process name and command line.
+
+    On Linux these are read directly from /proc, which is much cheaper than
+    going through psutil. psutil is used on other platforms or when /proc
+    can't be read.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            name = _read_proc_comm(proc.pid)
+            cmdline = _read_proc_cmdline(proc.pid)
+        except OSError:
+            pass
+        else:
+            # The kernel truncates comm to 15 characters. Like psutil, use
+            # the executable from the command line for the full name.
+            if len(name) >= 15 and cmdline:
+                exe_name = os.path.basename(cmdline[0])
+                if exe_name.startswith(name):
+                    name = exe_name
+            return name, cmdline
+    name = proc.name()
     try:
-        response = requests.get("https://api.ipify.org", timeout=2)
-        response.raise_for_status()
-        return response.text.strip()
-    except Exception:
-        return ""
+        cmdline = proc.cmdline()
+    except psutil.Error:
+        cmdline = []
+    return name, cmdline
 
 
 def get_app_name(proc: psutil.Process) -> str:
@@ -112,36 +333,82 @@ def get_app_name(proc: psutil.Process) -> str:
     For Python processes this attempts to show the script or module being
     executed instead of the python interpreter name.
     """
-    name = proc.name()
-    try:
-        cmdline = proc.cmdline()
-        # cmdline[0] is typically the executable path. When the process is
-        # a python interpreter the actual script follows as the next arg.
-        if cmdline and name.lower().startswith("python"):
-            if len(cmdline) > 1:
-                if cmdline[1] == "-m" and len(cmdline) > 2:
-                    return cmdline[2]
-                return os.path.basename(cmdline[1])
-    except (psutil.Error, IndexError):
-        pass
+    name, cmdline = _get_name_and_cmdline(proc)
+    # cmdline[0] is typically the executable path. When the process is
+    # a python interpreter the actual script follows as the next arg.
+    if cmdline and name.lower().startswith("python"):
+        if len(cmdline) > 1:
+            if cmdline[1] == "-m" and len(cmdline) > 2:
+                return cmdline[2]
+            return os.path.basename(cmdline[1])
     return name
 
 
+def get_listeners() -> List:
+    """Return the sockets currently in the LISTEN state.
 
+    The result is cached for ``_LISTENERS_TTL`` seconds. Only TCP sockets are
+    scanned because UDP sockets never report a LISTEN status.
+    """
+    with _listeners_lock:
+        ts = _listeners_cache["ts"]
+        if ts is not None and time.monotonic() - ts < _LISTENERS_TTL:
+            return _listeners_cache["conns"]
+        conns = [
+            conn for conn in psutil.net_connections(kind="tcp")
+            if conn.status == psutil.CONN_LISTEN and conn.laddr
+        ]
+        _listeners_cache["conns"] = conns
+        _listeners_cache["ts"] = time.monotonic()
+        return conns
 
-def list_services() -> List[Dict]:
+
+def _is_local_address(ip: str) -> bool:
+    """Return True for loopback and link-local addresses.
+
+    Services bound only to these addresses can't be reached through a port
+    forward, so there is no point probing them.
+    """
+    try:
+        # Strip any IPv6 scope suffix such as "fe80::1%eth0".
+        addr = ipaddress.ip_address(ip.split("%")[0])
+    except ValueError:
+        return False
+    if addr.version == 6 and addr.ipv4_mapped:
+        addr = addr.ipv4_mapped
+    return addr.is_loopback or addr.is_link_local
+
+
+def _get_cached_details(
+    pid: int, port: int, create_time: float, now: float
+) -> Optional[Dict]:
+    """Return cached details for a service if they are still valid."""
+    cached = _svc_cache.get((pid, port))
+    if (
+        cached
+        and now - cached[0] < _SVC_CACHE_TTL
+        and cached[1]["create_time"] == create_time
+    ):
+        return cached[1]
+    return None
+
+
+def _collect_services() -> List[Dict]:
     """Gather information about running services that are listening on a port."""
     services = []
     seen_ports = set()
     public_ip = get_public_ip()
+    now = time.monotonic()
 
-    # Iterate over all network connections looking for listeners.
-    for conn in psutil.net_connections(kind="inet"):
-        if conn.status != psutil.CONN_LISTEN:
-            continue
-        if not conn.laddr:
-            continue
+    # Group listening ports by PID so each process is only inspected once,
+    # even when it listens on several ports.
+    ports_by_pid: Dict[int, List[Tuple[int, str]]] = {}
+    # Ports with at least one binding reachable from outside the machine.
+    exposed_ports = set()
+    for conn in get_listeners():
         port = conn.laddr.port
+        if not _is_local_address(conn.laddr.ip):
+            exposed_ports.add(port)
         # Avoid listing the same port multiple times.
         if port in seen_ports:
             continue
@@ -150,39 +417,160 @@ def list_services() -> List[Dict]:
         pid = conn.pid
         if pid is None:
             continue
+        protocol = "tcp" if conn.type == socket.SOCK_STREAM else "udp"
+        ports_by_pid.setdefault(pid, []).append((port, protocol))
+
+    for pid, ports in ports_by_pid.items():
         try:
-            proc = psutil.Process(pid)
-            # Determine a human friendly name for the process. For Python
-            # interpreters this will try to display the script that was run
-            # instead of just the Python executable name.
-            name = get_app_name(proc)
-            create_time = proc.create_time()
-            uptime = format_uptime(time.time() - create_time)
-            cpu = proc.cpu_percent(interval=0.1)
-            mem = proc.memory_info().rss / (1024 * 1024)
-            protocol = "tcp" if conn.type == socket.SOCK_STREAM else "udp"
-            forwarded = False
-            if public_ip:
-                forwarded = check_port_forwarding(public_ip, port)
-            services.append({
-                "pid": pid,
-                "name": name,
-                "port": port,
-                "protocol": protocol,
-                "uptime": uptime,
-                "cpu": cpu,
-                "mem": mem,
-                "forwarded": forwarded,
-            })
+            proc = _proc_cache.get(pid)
+            # is_running() also detects a PID that was reused by a new process.
+            if proc is None or not proc.is_running():
+                proc = psutil.Process(pid)
+                _proc_cache[pid] = proc
+            # oneshot() lets psutil read /proc once for all of the calls below
+            # instead of re-reading it for every attribute.
+            with proc.oneshot():
+                create_time = proc.create_time()
+                cached = {
+                    port: _get_cached_details(pid, port, create_time, now)
+                    for port, _ in ports
+                }
+                name = next(
+                    (c["name"] for c in cached.values() if c is not None), None
+                )
+                if name is None:
+                    # Determine a human friendly name for the process. For
+                    # Python interpreters this will try to display the script
+                    # that was run instead of just the Python executable name.
+                    name = get_app_name(proc)
+                uptime = format_uptime(time.time() - create_time)
+                cpu = proc.cpu_percent(interval=None)
+                mem = _get_rss_mb(proc)
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             # The process may have finished or we don't have permission.
             continue
 
+        info = {
+            "pid": pid,
+            "name": name,
+            "uptime": uptime,
+            "cpu": cpu,
+            "mem": mem,
+            "cpu_str": f"{cpu:.1f}",
+            "mem_str": f"{mem:.1f}",
+            "create_time": create_time,
+        }
+        # Emit one row per port, sharing the process level details. A
+        # forwarded value of None marks the port as still needing a probe.
+        for port, protocol in ports:
+            services.append(dict(
+                info,
+                port=port,
+                protocol=protocol,
+                external_url=f"{EXTERNAL_IP}:{port}",
+                forwarded=cached[port]["forwarded"] if cached[port] else None,
+            ))
+
+    # Probe port forwarding for all services in one batch so the total wait
+    # is a single timeout instead of one per port. Only ports without a
+    # cached result are probed.
+    pending = [svc for svc in services if svc["forwarded"] is None]
+    if pending:
+        ports = [svc["port"] for svc in pending]
+        # Ports bound only to loopback or link-local addresses can't be
+        # forwarded, so they are never probed.
+        probe_ports = [port for port in ports if port in exposed_ports]
+        results = dict.fromkeys(ports, False)
+        if public_ip and probe_ports:
+            results.update(check_ports_forwarding(public_ip, probe_ports))
+        for svc in pending:
+            svc["forwarded"] = results[svc["port"]]
+            _svc_cache[(svc["pid"], svc["port"])] = (now, {
+                "name": svc["name"],
+                "forwarded": svc["forwarded"],
+                "create_time": svc["create_time"],
+            })
+
+    # Drop cache entries for processes that are no longer listening.
+    for key in list(_svc_cache):
+        if key[0] not in ports_by_pid:
+            _svc_cache.pop(key, None)
+    for pid in list(_proc_cache):
+        if pid not in ports_by_pid:
+            _proc_cache.pop(pid, None)
+
+    # Pre-format the forwarding column so the template only emits values.
+    for svc in services:
+        svc["forwarded_str"] = "Yes" if svc["forwarded"] else "No"
+
     # Sort services by port for consistent ordering.
     services.sort(key=lambda s: s["port"])
     return services
 
 
+def _publish_snapshot(services: List[Dict]) -> None:
+    """Store a new snapshot, hiding recently stopped PIDs.
+
+    The caller must hold ``_snapshot_lock``.
+    """
+    now = time.monotonic()
+    listening = {svc["pid"] for svc in services}
+    for pid, deadline in list(_forgotten_pids.items()):
+        if pid not in listening or now >= deadline:
+            del _forgotten_pids[pid]
+    _snapshot["services"] = [
+        svc for svc in services if svc["pid"] not in _forgotten_pids
+    ]
+
+
+def _refresh_loop() -> None:
+    """Keep the service snapshot up to date in the background."""
+    while True:
+        time.sleep(_SNAPSHOT_INTERVAL)
+        try:
+            services = _collect_services()
+        except Exception:
+            # Keep serving the previous snapshot and try again next time.
+            logger.exception("Failed to refresh the service snapshot")
+            continue
+        with _snapshot_lock:
+            _publish_snapshot(services)
+
+
+def list_services() -> List[Dict]:
+    """Return the latest snapshot of running services.
+
+    The first call collects the services directly and starts a background
+    thread that refreshes the snapshot every ``_SNAPSHOT_INTERVAL`` seconds,
+    so later requests don't have to wait on psutil or port probes.
+    """
+    with _snapshot_lock:
+        services = _snapshot["services"]
+        if services is None:
+            services = _collect_services()
+            _publish_snapshot(services)
+            services = _snapshot["services"]
+            threading.Thread(target=_refresh_loop, daemon=True).start()
+    return list(services)
+
+
+def _forget_services(pid: Optional[int] = None) -> None:
+    """Make the next page load reflect a stop, restart or add.
+
+    Rows for ``pid`` are hidden from the snapshot until the process stops
+    listening, the next refresh rescans the listening sockets so new services
+    show up, and the cached page is cleared.
+    """
+    with _snapshot_lock:
+        if pid is not None:
+            _forgotten_pids[pid] = time.monotonic() + _FORGET_TIMEOUT
+            if _snapshot["services"] is not None:
+                _publish_snapshot(_snapshot["services"])
+    with _listeners_lock:
+        _listeners_cache["ts"] = None
+    cache.clear()
+
+
 @app.route("/stop/<int:pid>", methods=["POST"])
 def stop_service(pid: int):
     """Terminate the process with the given PID."""
@@ -192,6 +580,8 @@ def stop_service(pid: int):
         proc.terminate()
     except psutil.NoSuchProcess:
         pass
+    # Show the change straight away instead of a cached page.
+    _forget_services(pid)
     return redirect(url_for("index"))
 
 
@@ -209,6 +599,7 @@ def restart_service(pid: int):
     if cmd:
         # Launch the new command in the background if provided
         subprocess.Popen(cmd, shell=True)
+    _forget_services(pid)
     return redirect(url_for("index"))
 
 
@@ -219,19 +610,82 @@ def add_service():
     if path:
         # Launch the service using the provided path/command
         subprocess.Popen(path, shell=True)
+    _forget_services()
     return redirect(url_for("index"))
 
 
+def services_etag(host: str, services: List[Dict]) -> str:
+    """Build an ETag from everything the index page displays.
+
+    Two pages with the same ETag render identically, so the page can be
+    skipped entirely when a client already holds it.
+    """
+    parts = [host, EXTERNAL_IP]
+    for svc in services:
+        parts.append(":".join(str(svc[k]) for k in (
+            "pid", "port", "protocol", "name", "uptime",
+            "cpu_str", "mem_str", "forwarded",
+        )))
+    return hashlib.md5(";".join(parts).encode("utf-8")).hexdigest()
+
+
+def _not_modified(etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already has this page."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
 @app.route("/")
 def index():
-    host = request.host.split(":")[0]
+    # The page embeds the request host in its links, so cache per host. Both
+    # the plain and gzipped bodies are cached so repeat requests within the
+    # cache window skip rendering and compression entirely.
+    cache_key = f"idx:{request.host}"
+    page = cache.get(cache_key)
+    if page is None:
+        host = request.host.split(":")[0]
+        services = list_services()
+        etag = services_etag(host, services)
+        # Skip rendering when the client's copy is still current.
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+        body = _TEMPLATE.render(
+            services=services,
+            host=host,
+        ).encode("utf-8")
+        page = (etag, body, gzip.compress(body, compresslevel=1))
+        cache.set(cache_key, page, timeout=INDEX_CACHE_TIMEOUT)
+
+    etag, body, gzipped = page
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    response = Response(body, content_type="text/html; charset=utf-8")
+    if request.accept_encodings["gzip"]:
+        response.set_data(gzipped)
+        response.headers["Content-Encoding"] = "gzip"
+    response.set_etag(etag, weak=True)
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+# Fields included in the machine readable service list. Display-only values
+# such as the friendly name are left out.
+API_FIELDS = ("pid", "port", "protocol", "cpu", "mem", "forwarded")
+
+
+@app.route("/api/services")
+def api_services():
+    """Return the running services as JSON for scripts and monitoring."""
     services = list_services()
-    return render_template_string(
-        HTML_TEMPLATE,
-        services=services,
-        host=host,
-        external_ip=EXTERNAL_IP,
-    )
+    return jsonify([
+        {key: svc[key] for key in API_FIELDS} for svc in services
+    ])
 
 
 if __name__ == "__main__":
@@ -256,7 +710,10 @@ if __name__ == "__main__":
     if args.production:
         # Waitress serves the Flask app with better performance than the
         # built-in development server and is safe for production use.
-        serve(app, host="0.0.0.0", port=args.port)
+        # Extra worker threads keep slow page builds from blocking the
+        # lightweight stop/restart/add requests.
+        threads = max(4, 2 * (os.cpu_count() or 1))
+        serve(app, host="0.0.0.0", port=args.port, threads=threads)
     else:
         # Flask development server is convenient for testing and debugging.
         app.run(host="0.0.0.0", port=args.port)
@@ -0,0 +1,18 @@
+from unittest import mock
+
+import pytest
+
+import rpi_nsn8000
+
+
+@pytest.mark.parametrize("data, expected", [
+    (b"", []),
+    (b"python3\x00app.py\x00--port\x008000\x00", ["python3", "app.py", "--port", "8000"]),
+    # Command lines rewritten as one space separated string, with and
+    # without a trailing NUL.
+    (b"python3 app.py --port 8000\x00", ["python3", "app.py", "--port", "8000"]),
+    (b"python3 app.py --port 8000", ["python3", "app.py", "--port", "8000"]),
+])
+def test_read_proc_cmdline(data, expected):
+    with mock.patch("builtins.open", mock.mock_open(read_data=data)):
+        assert rpi_nsn8000._read_proc_cmdline(1) == expected